@@ -1,19 +1,92 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import cohere
 from urllib.parse import urlparse
 import whois
-import datetime
+import tldextract
+import time
 import re
 import os
 import ssl
 import socket
 import random
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from bs4 import BeautifulSoup
+from cachetools import TTLCache, LRUCache
 
 app = Flask(__name__)
 
 COHERE_API_KEY = os.getenv('COHERE_API_KEY')
+COHERE_MODEL = os.getenv('COHERE_MODEL', 'command')
+
+COHERE_TIMEOUT = 30
+
+# One client for the whole app; skip the key check so startup doesn't hit the API,
+# and don't retry so a stuck call gives up after COHERE_TIMEOUT
+co = cohere.Client(COHERE_API_KEY, check_api_key=False, timeout=COHERE_TIMEOUT, max_retries=0)
+# Optional local ONNX classifier used instead of Cohere (requires onnxruntime)
+SCAM_MODEL_PATH = os.getenv('SCAM_MODEL_PATH')
+# Scam probabilities at which the local classifier's AI penalty starts and reaches its cap
+LOCAL_MODEL_SAFE_PROBABILITY = 0.3
+LOCAL_MODEL_SCAM_PROBABILITY = 0.9
+
+# Shared HTTP session so repeat fetches reuse pooled TCP/TLS connections
+SESSION = requests.Session()
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+SESSION.mount('http://', HTTP_ADAPTER)
+SESSION.mount('https://', HTTP_ADAPTER)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+# Worker pool for the blocking lookups that don't depend on the page content. Each
+# request submits up to two tasks, so size it from the request threads per worker
+# (WEB_THREADS, also used by the Procfile)
+WEB_THREADS = int(os.getenv('WEB_THREADS', '32'))
+EXECUTOR = ThreadPoolExecutor(max_workers=2 * WEB_THREADS)
+WHOIS_TIMEOUT = 15
+HTTPS_TIMEOUT = 10
+# Only the first 2000 words are analyzed, so there's no need to download huge pages
+MAX_PAGE_BYTES = 512 * 1024
+
+# Per-component result caches, shared by all request threads
+WHOIS_CACHE = TTLCache(maxsize=10000, ttl=24 * 60 * 60)
+HTTPS_CACHE = TTLCache(maxsize=5000, ttl=60 * 60)
+COHERE_CACHE = TTLCache(maxsize=5000, ttl=7 * 24 * 60 * 60)
+PAGE_CACHE = TTLCache(maxsize=1000, ttl=5 * 60)
+# Last successful response per URL, served if a later fetch fails
+STALE_CACHE = LRUCache(maxsize=1000)
+CACHE_LOCK = threading.Lock()
+# Cohere analyses in flight, so concurrent scans of the same page share one call
+COHERE_PENDING = {}
+
+# Shared TLS context for HTTPS probes, so the CA bundle is loaded once rather than per probe
+TLS_CONTEXT = ssl.create_default_context()
+TLS_CONNECT_TIMEOUT = 5
+
+# Use tldextract's bundled public suffix list rather than fetching it at runtime
+TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())
+
+def cache_get(cache, key):
+    with CACHE_LOCK:
+        return cache.get(key)
+
+def cache_set(cache, key, value):
+    with CACHE_LOCK:
+        cache[key] = value
+
+def ojsonify(obj, status=200):
+    """Like flask.jsonify, but serialized with orjson"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
 
 def is_valid_url(url):
     try:
@@ -22,101 +95,144 @@ def is_valid_url(url):
     except:
         return False
 
+def get_registered_domain(domain):
+    """Collapse a host like www.example.com to its registrable domain (example.com)"""
+    return TLD_EXTRACT(domain).registered_domain or domain
+
+# Ordinal suffix by last digit of the day (1st, 2nd, 3rd, 4th, ...)
+ORDINAL_SUFFIXES = ('th', 'st', 'nd', 'rd', 'th', 'th', 'th', 'th', 'th', 'th')
+
 def get_domain_info(domain):
-    try:
-        w = whois.whois(domain)
-        
-        # Get creation date
-        if isinstance(w.creation_date, list):
-            creation_date = w.creation_date[0]
-        else:
-            creation_date = w.creation_date
-        
-        # Format creation date nicely
-        if creation_date:
-            # Format with ordinal suffix (1st, 2nd, 3rd, etc.)
-            day = creation_date.day
-            if 4 <= day <= 20 or 24 <= day <= 30:
-                suffix = "th"
+    # WHOIS records belong to the registrable domain, so subdomains share one entry
+    domain = get_registered_domain(domain)
+    
+    # The cache holds the already formatted date and the creation timestamp,
+    # so a hit only has to work out the current age
+    record = cache_get(WHOIS_CACHE, domain)
+    if record is None:
+        try:
+            w = whois.whois(domain)
+            
+            # Get creation date
+            if isinstance(w.creation_date, list):
+                creation_date = w.creation_date[0]
             else:
-                suffix = ["st", "nd", "rd"][day % 10 - 1]
+                creation_date = w.creation_date
             
-            formatted_date = creation_date.strftime(f"%A {day}{suffix}, %B %Y %I:%M %p")
-            age = (datetime.datetime.now() - creation_date).days
+            # Format creation date nicely
+            if creation_date:
+                # Format with ordinal suffix (1st, 2nd, 3rd, etc.)
+                day = creation_date.day
+                suffix = ORDINAL_SUFFIXES[0 if 11 <= day <= 13 else day % 10]
+                
+                record = {
+                    'creation_date': creation_date.strftime(f"%A {day}{suffix}, %B %Y %I:%M %p"),
+                    'created_at': int(creation_date.timestamp())
+                }
+            else:
+                record = {
+                    'creation_date': 'Unknown',
+                    'created_at': None
+                }
+            cache_set(WHOIS_CACHE, domain, record)
+        except Exception as e:
+            print(f"Error getting domain info: {str(e)}")
             return {
-                'creation_date': formatted_date,
-                'age_days': age
+                'creation_date': 'Unknown',
+                'age_days': 0
             }
-        return {
-            'creation_date': 'Unknown',
-            'age_days': 0
-        }
-    except Exception as e:
-        print(f"Error getting domain info: {str(e)}")
-        return {
-            'creation_date': 'Unknown',
-            'age_days': 0
-        }
+    
+    if record['created_at'] is None:
+        age = 0
+    else:
+        age = (int(time.time()) - record['created_at']) // 86400
+    return {
+        'creation_date': record['creation_date'],
+        'age_days': age
+    }
 
 def check_https(url):
+    # Extract domain (without any port) from URL
+    domain = urlparse(url).hostname
+    
+    cached = cache_get(HTTPS_CACHE, domain)
+    if cached is not None:
+        return cached
+    
     try:
-        # Extract domain from URL
-        domain = urlparse(url).netloc
-        
-        # Create a socket connection
-        context = ssl.create_default_context()
-        with socket.create_connection((domain, 443)) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                cert = ssock.getpeercert()
-                
-                # Check if certificate is valid
-                ssl.match_hostname(cert, domain)
-                
-                return "Valid HTTPS Found", "success"
+        # Create a socket connection; the handshake fails with an SSLError if the
+        # certificate is invalid, expired or doesn't match the hostname
+        with socket.create_connection((domain, 443), timeout=TLS_CONNECT_TIMEOUT) as sock:
+            with TLS_CONTEXT.wrap_socket(sock, server_hostname=domain):
+                result = "Valid HTTPS Found", "success"
     except ssl.SSLError:
-        return "Invalid or Expired Certificate", "danger"
+        result = "Invalid or Expired Certificate", "danger"
     except Exception as e:
         return f"HTTPS Error: {str(e)}", "warning"
+    
+    # Connection errors aren't cached so the next check retries
+    cache_set(HTTPS_CACHE, domain, result)
+    return result
 
-def get_blacklist_status(domain):
-    """Simulated blacklist check (in a real app, use API like Google Safe Browsing)"""
+def check_reputation(domain):
+    """Simulated blacklist and proximity check (in a real app, use a threat intelligence API)"""
     # For demo purposes, we'll simulate results
-    # In production, you'd use an API like:
+    # In production, both signals would come from a single request to an API like:
     # https://developers.google.com/safe-browsing
-    
-    # Simulated results - 5% chance of being blacklisted
-    if random.random() < 0.05:
-        return "Detected by multiple engines", "danger"
-    
-    # 10% chance of being suspicious
-    if random.random() < 0.1:
-        return "Suspicious activity detected", "warning"
-    
-    return "Not detected by any blacklist engine", "success"
-
-def get_proximity_score(domain):
-    """Simulated proximity to suspicious websites (in a real app, use threat intelligence API)"""
-    # For demo purposes, we'll generate a random score
-    # In production, you'd use an API like:
     # https://www.phishtank.com/developer_info.php
+    blacklist_roll, suspicious_roll = random.random(), random.random()
     
-    # Generate a random score between 0-100
+    # Simulated results - 5% chance of being blacklisted, otherwise 10% chance of being suspicious
+    if blacklist_roll < 0.05:
+        blacklist_status, blacklist_class = "Detected by multiple engines", "danger"
+    elif suspicious_roll < 0.1:
+        blacklist_status, blacklist_class = "Suspicious activity detected", "warning"
+    else:
+        blacklist_status, blacklist_class = "Not detected by any blacklist engine", "success"
+    
+    # Generate a random proximity score between 0-100
     score = random.randint(0, 100)
     
     # Determine status
     if score > 70:
-        status = "danger"
+        proximity_class = "danger"
     elif score > 40:
-        status = "warning"
+        proximity_class = "warning"
     else:
-        status = "success"
-        
-    return score, status
+        proximity_class = "success"
+    
+    return {
+        'blacklist_status': blacklist_status,
+        'blacklist_class': blacklist_class,
+        'proximity_score': score,
+        'proximity_class': proximity_class
+    }
 
 def analyze_with_cohere(text):
+    key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    with CACHE_LOCK:
+        cached = COHERE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        
+        # Wait for an identical request that's already running instead of repeating it
+        pending = COHERE_PENDING.get(key)
+        if pending is None:
+            future = COHERE_PENDING[key] = Future()
+    if pending is not None:
+        try:
+            return pending.result(timeout=COHERE_TIMEOUT + 5)
+        except FutureTimeoutError:
+            return "Error analyzing with Cohere: timed out waiting for analysis"
+        except Exception as e:
+            return f"Error analyzing with Cohere: {str(e)}"
+    
+    analysis = None
+    succeeded = False
     try:
         response = co.generate(
-            model='command',
+            model=COHERE_MODEL,
             prompt=f"""Analyze the following website content and determine if it's likely to be a scam. 
             Consider factors like suspicious offers, poor grammar, urgency tactics, and other red flags.
             
@@ -129,11 +245,73 @@ def analyze_with_cohere(text):
             stop_sequences=[],
             return_likelihoods='NONE'
         )
-        return response.generations[0].text
+        analysis = response.generations[0].text
+        succeeded = True
     except Exception as e:
-        return f"Error analyzing with Cohere: {str(e)}"
+        analysis = f"Error analyzing with Cohere: {str(e)}"
+    finally:
+        # Always release waiters, even if something like KeyboardInterrupt escaped
+        with CACHE_LOCK:
+            # Errors aren't cached so the next scan retries
+            if succeeded:
+                COHERE_CACHE[key] = analysis
+            del COHERE_PENDING[key]
+        if analysis is None:
+            future.set_exception(RuntimeError("analysis was interrupted"))
+        else:
+            future.set_result(analysis)
+    return analysis
+
+def load_scam_model(path):
+    """Load a local scam classifier, e.g. a TF-IDF + LogisticRegression pipeline
+    exported with skl2onnx, taking a [N, 1] string tensor as input"""
+    if not path:
+        return None
+    import onnxruntime
+    return onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+
+SCAM_MODEL = load_scam_model(SCAM_MODEL_PATH)
+
+def analyze_with_local_model(text):
+    """Return the classifier's verdict text and its AI penalty (0-30 points)"""
+    try:
+        input_name = SCAM_MODEL.get_inputs()[0].name
+        _, probabilities = SCAM_MODEL.run(None, {input_name: [[text]]})
+        # Probability of the positive (scam) class, from either a ZipMap dict or a plain array
+        probability = float(probabilities[0][1])
+    except Exception as e:
+        return f"Error analyzing with local model: {str(e)}", 0
+    
+    # Scale the penalty linearly from nothing at LOCAL_MODEL_SAFE_PROBABILITY up to
+    # the full 30 points at LOCAL_MODEL_SCAM_PROBABILITY and above
+    span = LOCAL_MODEL_SCAM_PROBABILITY - LOCAL_MODEL_SAFE_PROBABILITY
+    ai_penalty = min(30, max(0, (probability - LOCAL_MODEL_SAFE_PROBABILITY) / span * 30))
+    
+    # Label from the same thresholds: no penalty, partial penalty, or the full 30 points
+    if probability >= LOCAL_MODEL_SCAM_PROBABILITY:
+        verdict = "likely scam"
+    elif probability <= LOCAL_MODEL_SAFE_PROBABILITY:
+        verdict = "likely legitimate"
+    else:
+        verdict = "possibly a scam"
+    return f"Local classifier verdict: {verdict} ({probability:.0%} scam probability).", ai_penalty
+
+def analyze_content(text):
+    """Return the analysis text and an AI penalty, or None to score the text's phrases"""
+    if SCAM_MODEL is not None:
+        return analyze_with_local_model(text)
+    return analyze_with_cohere(text), None
 
-def calculate_trust_index(domain_age, content, cohere_analysis, https_status, blacklist_status, proximity_score):
+# Keyword tables used by calculate_trust_index, built once at import
+SCAM_WORDS = ('win', 'free', 'urgent', 'limited', 'offer', 'prize', 'congratulations', 'lottery', 'selected')
+NEGATIVE_PHRASES = ('likely scam', 'suspicious', 'fraudulent', 'high risk', 'be cautious', 'phishing')
+POSITIVE_PHRASES = ('likely legitimate', 'appears safe', 'low risk', 'trustworthy')
+# An analysis containing every negative phrase gets the maximum AI penalty
+WORST_CASE_ANALYSIS = ' '.join(NEGATIVE_PHRASES)
+# Pages with less text than this aren't worth sending for AI analysis
+MIN_ANALYSIS_CHARS = 200
+
+def calculate_trust_index(domain_age, content, cohere_analysis, https_status, blacklist_status, proximity_score, ai_penalty=None):
     """Calculate a trust index from 0-100% based on multiple factors"""
     trust_score = 100
     reasons = []
@@ -144,22 +322,24 @@ def calculate_trust_index(domain_age, content, cohere_analysis, https_status, bl
         trust_score -= penalty
         reasons.append(f"New domain ({domain_age} days old): -{penalty:.1f}% trust")
     
+    # Lowercase each text once; str.count() on the result is faster than a
+    # single-pass regex or Aho-Corasick scan for this few patterns
+    content = content.lower()
+    cohere_analysis = cohere_analysis.lower()
+    
     # Common scam words penalty (max 15 points)
-    scam_words = ['win', 'free', 'urgent', 'limited', 'offer', 'prize', 'congratulations', 'lottery', 'selected']
-    word_count = sum(content.lower().count(word) for word in scam_words)
+    word_count = sum(content.count(word) for word in SCAM_WORDS)
     if word_count > 0:
         penalty = min(15, word_count * 2)
         trust_score -= penalty
         reasons.append(f"Suspicious keywords detected: -{penalty:.1f}% trust")
     
-    # Cohere analysis penalty (max 30 points)
-    negative_phrases = ['likely scam', 'suspicious', 'fraudulent', 'high risk', 'be cautious', 'phishing']
-    positive_phrases = ['likely legitimate', 'appears safe', 'low risk', 'trustworthy']
-    
-    negative_score = sum(cohere_analysis.lower().count(phrase) for phrase in negative_phrases) * 5
-    positive_score = sum(cohere_analysis.lower().count(phrase) for phrase in positive_phrases) * 5
-    
-    ai_penalty = min(30, max(0, negative_score - positive_score))
+    # Cohere analysis penalty (max 30 points), unless the analysis came with its own
+    if ai_penalty is None:
+        negative_score = sum(cohere_analysis.count(phrase) for phrase in NEGATIVE_PHRASES) * 5
+        positive_score = sum(cohere_analysis.count(phrase) for phrase in POSITIVE_PHRASES) * 5
+        
+        ai_penalty = min(30, max(0, negative_score - positive_score))
     if ai_penalty > 0:
         trust_score -= ai_penalty
         reasons.append(f"AI detected red flags: -{ai_penalty:.1f}% trust")
@@ -173,8 +353,9 @@ def calculate_trust_index(domain_age, content, cohere_analysis, https_status, bl
         reasons.append(f"Invalid HTTPS: -15% trust")
     
     # Blacklist penalty
-    if "detected" in blacklist_status.lower() or "suspicious" in blacklist_status.lower():
-        penalty = 30 if "multiple" in blacklist_status.lower() else 15
+    blacklist_status = blacklist_status.lower()
+    if "detected" in blacklist_status or "suspicious" in blacklist_status:
+        penalty = 30 if "multiple" in blacklist_status else 15
         trust_score -= penalty
         reasons.append(f"Blacklist status: -{penalty}% trust")
     
@@ -213,42 +394,92 @@ def check_url():
     url = request.form.get('url')
     
     if not url:
-        return jsonify({'error': 'URL is required'}), 400
+        return ojsonify({'error': 'URL is required'}, status=400)
     
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
     
     if not is_valid_url(url):
-        return jsonify({'error': 'Invalid URL format'}), 400
+        return ojsonify({'error': 'Invalid URL format'}, status=400)
     
     try:
-        # Get website content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        domain = urlparse(url).netloc
         
-        # Extract text content using BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        text_content = soup.get_text()
-        text_content = ' '.join(text_content.split()[:2000])  # Limit to first 2000 words
+        # Start WHOIS (and, for plain http URLs, the HTTPS probe) in the background
+        # while the page is fetched. For https URLs the fetch itself verifies the
+        # certificate, so a second handshake would tell us nothing new.
+        domain_info_future = EXECUTOR.submit(get_domain_info, domain)
+        https_future = None
+        if not url.startswith('https://'):
+            https_future = EXECUTOR.submit(check_https, url)
         
-        # Get domain info
-        domain = urlparse(url).netloc
-        domain_info = get_domain_info(domain)
+        text_content = cache_get(PAGE_CACHE, url)
+        if text_content is None:
+            # Get website content, reading at most MAX_PAGE_BYTES of the body
+            with SESSION.get(url, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= MAX_PAGE_BYTES:
+                        break
+                body = b''.join(chunks)
+            
+            # Extract text content using BeautifulSoup (lxml parses the raw bytes in C)
+            soup = BeautifulSoup(body, 'lxml')
+            for tag in soup(['script', 'style']):
+                tag.decompose()
+            text_content = soup.get_text()
+            # Limit to first 2000 words; maxsplit stops splitting once they're found
+            text_content = ' '.join(text_content.split(None, 2000)[:2000])
+            cache_set(PAGE_CACHE, url, text_content)
         
-        # Get HTTPS status
-        https_status, https_class = check_https(url)
+        # Get blacklist status and proximity score
+        reputation = check_reputation(domain)
+        blacklist_status = reputation['blacklist_status']
+        blacklist_class = reputation['blacklist_class']
+        proximity_score = reputation['proximity_score']
+        proximity_class = reputation['proximity_class']
         
-        # Get blacklist status
-        blacklist_status, blacklist_class = get_blacklist_status(domain)
+        # Get domain info
+        try:
+            domain_info = domain_info_future.result(timeout=WHOIS_TIMEOUT)
+        except FutureTimeoutError:
+            # Drop the lookup if it hasn't started so it doesn't hold up later requests
+            domain_info_future.cancel()
+            print("Error getting domain info: WHOIS lookup timed out")
+            domain_info = {
+                'creation_date': 'Unknown',
+                'age_days': 0
+            }
         
-        # Get proximity score
-        proximity_score, proximity_class = get_proximity_score(domain)
+        # Get HTTPS status
+        if https_future is None:
+            # requests raises on an invalid certificate, so reaching here means it was valid
+            https_status, https_class = "Valid HTTPS Found", "success"
+        else:
+            try:
+                https_status, https_class = https_future.result(timeout=HTTPS_TIMEOUT)
+            except FutureTimeoutError:
+                https_future.cancel()
+                https_status, https_class = "HTTPS Error: connection timed out", "warning"
         
-        # Analyze with Cohere
-        analysis = analyze_with_cohere(text_content)
+        # Skip the AI analysis when it can't change the outcome: near-empty pages, or
+        # when the best and worst possible analyses land in the same trust band
+        ai_penalty = None
+        if len(text_content) < MIN_ANALYSIS_CHARS:
+            analysis = "Analysis skipped: not enough page content to analyze."
+        else:
+            signals = (https_status, blacklist_status, proximity_score)
+            best_case = calculate_trust_index(domain_info['age_days'], text_content, '', *signals)
+            worst_case = calculate_trust_index(domain_info['age_days'], text_content, WORST_CASE_ANALYSIS, *signals)
+            if best_case['status'] == worst_case['status']:
+                analysis = "Analysis skipped: decision determined by other signals."
+            else:
+                # Analyze with the local classifier if configured, otherwise Cohere
+                analysis, ai_penalty = analyze_content(text_content)
         
         # Calculate trust index
         trust_index = calculate_trust_index(
@@ -257,10 +488,11 @@ def check_url():
             analysis,
             https_status,
             blacklist_status,
-            proximity_score
+            proximity_score,
+            ai_penalty
         )
         
-        return jsonify({
+        result = {
             'url': url,
             'domain': domain,
             'domain_creation_date': domain_info['creation_date'],
@@ -277,13 +509,27 @@ def check_url():
             'trust_status': trust_index['status'],
             'trust_class': trust_index['status_class'],
             'trust_reasons': trust_index['reasons'],
-            'status': 'success'
-        })
+            'status': 'success',
+            'stale': False
+        }
+        cache_set(STALE_CACHE, url, result)
+        return ojsonify(result)
         
     except requests.exceptions.RequestException as e:
-        return jsonify({'error': f'Failed to fetch URL: {str(e)}'}), 400
+        # Fall back to the last good result only if the site couldn't be reached.
+        # Certificate failures (SSLError) and error status codes (HTTPError) are
+        # findings about the site itself, so they're always reported.
+        is_outage = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        if is_outage and not isinstance(e, requests.exceptions.SSLError):
+            stale = cache_get(STALE_CACHE, url)
+            if stale is not None:
+                response = ojsonify(dict(stale, stale=True))
+                response.headers['X-Cache'] = 'STALE'
+                return response
+        return ojsonify({'error': f'Failed to fetch URL: {str(e)}'}, status=400)
     except Exception as e:
-        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+        return ojsonify({'error': f'An error occurred: {str(e)}'}, status=500)
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Development server only; production runs under gunicorn (see Procfile)
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1')